@@ -139,44 +139,79 @@ ai.defineTool(
 
 // --- Finance Tools ---
 
+// Shared by the single-option and batch option tools.
+const optionInputSchema = z.object({
+  S: z.number().positive(),
+  K: z.number().positive(),
+  T: z.number().positive(),
+  r: z.number(),
+  sigma: z.number().positive(),
+  optionType: z.enum(['call', 'put']).default('call')
+});
+
+const greeksOutputSchema = z.object({
+  delta: z.number(),
+  gamma: z.number(),
+  vega: z.number(),
+  theta: z.number(),
+  rho: z.number()
+});
+
+// Splits a list of option objects into the S, K, T, r, sigma, optionType columns the batch functions take.
+const optionColumns = (options) => [
+  options.map((o) => o.S),
+  options.map((o) => o.K),
+  options.map((o) => o.T),
+  options.map((o) => o.r),
+  options.map((o) => o.sigma),
+  options.map((o) => o.optionType)
+];
+
 ai.defineTool(
   {
     name: 'black_scholes',
     description: 'Price a European option using Black-Scholes formula. Inputs: S (price), K (strike), T (years), r (rate), sigma (vol).',
-    inputSchema: z.object({
-      S: z.number().positive(),
-      K: z.number().positive(),
-      T: z.number().positive(),
-      r: z.number(),
-      sigma: z.number().positive(),
-      optionType: z.enum(['call', 'put']).default('call')
-    }),
+    inputSchema: optionInputSchema,
     outputSchema: z.number(),
   },
   async (args) => finance.blackScholes(args.S, args.K, args.T, args.r, args.sigma, args.optionType)
 );
 
+ai.defineTool(
+  {
+    name: 'batch_black_scholes',
+    description: 'Price many European options in one call with the Black-Scholes formula. Returns prices in input order.',
+    inputSchema: z.object({
+      options: z.array(optionInputSchema).min(1).max(10000).describe('Options to price (max 10,000)')
+    }),
+    outputSchema: z.array(z.number()),
+  },
+  async ({ options }) => finance.blackScholesBatch(...optionColumns(options))
+);
+
 ai.defineTool(
   {
     name: 'option_greeks',
     description: 'Calculate Delta, Gamma, Vega, Theta, and Rho for an option.',
+    inputSchema: optionInputSchema,
+    outputSchema: greeksOutputSchema,
+  },
+  async (args) => finance.optionGreeks(args.S, args.K, args.T, args.r, args.sigma, args.optionType)
+);
+
+ai.defineTool(
+  {
+    name: 'batch_greeks',
+    description: 'Calculate Delta, Gamma, Vega, Theta, and Rho for many options in one call. Returns Greeks in input order.',
     inputSchema: z.object({
-      S: z.number().positive(),
-      K: z.number().positive(),
-      T: z.number().positive(),
-      r: z.number(),
-      sigma: z.number().positive(),
-      optionType: z.enum(['call', 'put']).default('call')
-    }),
-    outputSchema: z.object({
-      delta: z.number(),
-      gamma: z.number(),
-      vega: z.number(),
-      theta: z.number(),
-      rho: z.number()
+      options: z.array(optionInputSchema).min(1).max(10000).describe('Options to evaluate (max 10,000)')
     }),
+    outputSchema: z.array(greeksOutputSchema),
   },
-  async (args) => finance.optionGreeks(args.S, args.K, args.T, args.r, args.sigma, args.optionType)
+  async ({ options }) => {
+    const { delta, gamma, vega, theta, rho } = finance.optionGreeksBatch(...optionColumns(options));
+    return delta.map((_, i) => ({ delta: delta[i], gamma: gamma[i], vega: vega[i], theta: theta[i], rho: rho[i] }));
+  }
 );
 
 ai.defineTool(
@@ -297,6 +332,21 @@ ai.defineTool(
   async (args) => transform.fourierTransform(args.expression, args.timeVar, args.freqVar)
 );
 
+ai.defineTool(
+  {
+    name: 'z_transform',
+    description: 'Numerical approximation of the unilateral Z-transform of a sequence x[n], truncated after a finite number of terms.',
+    inputSchema: z.object({
+      expression: z.string().describe('x[n]'),
+      indexVar: z.string().default('n'),
+      zValue: z.number().describe('z (point at which to evaluate the transform)'),
+      limit: z.number().int().min(0).max(10000).optional().default(100).describe('Last term index (default 100, max 10,000)')
+    }),
+    outputSchema: z.string(),
+  },
+  async (args) => transform.zTransform(args.expression, args.indexVar, args.zValue, args.limit)
+);
+
 // --- Optimization Tools ---
 
 ai.defineTool(
@@ -335,11 +385,12 @@ ai.defineTool(
     if (t.includes('volume') || t.includes('revolution')) suggestions.push('volume_of_revolution');
     if (t.includes('matrix') || t.includes('inverse') || t.includes('multiply')) suggestions.push('matrix_multiply', 'matrix_inverse', 'matrix_determinant');
     if (t.includes('eigen')) suggestions.push('eigenvalues');
-    if (t.includes('option') || t.includes('black') || t.includes('greek')) suggestions.push('black_scholes', 'option_greeks');
+    if (t.includes('option') || t.includes('black') || t.includes('greek')) suggestions.push('black_scholes', 'option_greeks', 'batch_black_scholes', 'batch_greeks');
     if (t.includes('sharpe') || t.includes('risk')) suggestions.push('sharpe_ratio', 'value_at_risk');
     if (t.includes('cash') || t.includes('schedule') || t.includes('interest')) suggestions.push('cashflow_schedule', 'compound_interest');
     if (t.includes('prob') || t.includes('distrib') || t.includes('normal') || t.includes('poisson') || t.includes('binom')) suggestions.push('normal_distribution', 'binomial_distribution', 'poisson_distribution');
     if (t.includes('laplace') || t.includes('fourier')) suggestions.push('laplace_transform', 'fourier_transform');
+    if (t.includes('z-transform') || t.includes('z transform')) suggestions.push('z_transform');
     if (t.includes('root') || t.includes('solve')) suggestions.push('find_root');
     
     return {
@@ -0,0 +1,55 @@
+/**
+ * Creates a bounded least-recently-used cache backed by a Map.
+ * Map iteration order is insertion order, so re-inserting on hit keeps
+ * the oldest entry first in line for eviction.
+ * @param {number} maxSize
+ */
+export const createLRUCache = (maxSize = 1024) => {
+  const entries = new Map();
+
+  return {
+    get(key) {
+      if (!entries.has(key)) return undefined;
+      const value = entries.get(key);
+      entries.delete(key);
+      entries.set(key, value);
+      return value;
+    },
+    set(key, value) {
+      entries.delete(key);
+      entries.set(key, value);
+      if (entries.size > maxSize) {
+        entries.delete(entries.keys().next().value);
+      }
+      return value;
+    },
+    get size() {
+      return entries.size;
+    },
+    clear() {
+      entries.clear();
+    }
+  };
+};
+
+/**
+ * Wraps a function so calls with the same key reuse the first result.
+ * By default the key is the first argument; pass `key` to derive one from
+ * several arguments. Results are only stored once `fn` returns, so errors
+ * are never cached.
+ * @param {(...args: any[]) => any} fn
+ * @param {{ maxSize?: number, key?: (...args: any[]) => any }} [options]
+ */
+export const memoize = (fn, options = {}) => {
+  // Destructuring a bare number would silently fall back to the defaults.
+  if (typeof options !== 'object' || options === null) {
+    throw new TypeError('memoize expects an options object, e.g. { maxSize: 256 }');
+  }
+  const { maxSize = 1024, key = (arg) => arg } = options;
+  const cache = createLRUCache(maxSize);
+  return (...args) => {
+    const k = key(...args);
+    const hit = cache.get(k);
+    return hit !== undefined ? hit : cache.set(k, fn(...args));
+  };
+};
@@ -1,69 +1,82 @@
 import * as math from 'mathjs';
+import { memoize } from './cache.js';
+import { parseExpression, compileNumeric } from './expression.js';
+
+// Symbolic differentiation runs mathjs' simplify pass, so keep the printed
+// result for repeated (expression, variable) pairs.
+const printedDerivative = memoize(
+  (expr, variable) => math.derivative(parseExpression(expr), variable).toString(),
+  { maxSize: 2048, key: (expr, variable) => JSON.stringify([expr, variable]) }
+);
 
 export const derivative = (expr, variable = 'x') => {
   try {
-    const node = math.parse(expr);
-    const derivativeExpr = math.derivative(node, variable);
-    return derivativeExpr.toString();
+    return printedDerivative(expr, variable);
   } catch (e) {
     throw new Error(`Derivative error: ${e.message}`);
   }
 };
 
+const escapeRegExp = (text) => text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+
+// The power-rule regex and lookup table depend only on the variable name,
+// so build them once per variable rather than on every call.
+const integralRules = memoize((variable) => ({
+  power: new RegExp(`^${escapeRegExp(variable)}\\^(\\d+)$`),
+  table: new Map([
+    [`e^${variable}`, `e^${variable}`],
+    [`1/${variable}`, `ln|${variable}|`],
+    [`sin(${variable})`, `-cos(${variable})`],
+    [`cos(${variable})`, `sin(${variable})`],
+    [variable, `${variable}^2/2`]
+  ])
+}), { maxSize: 256 });
+
 export const integral = (expr, variable = 'x') => {
   try {
-    // For basic polynomials
-    const powerMatch = expr.match(new RegExp(`${variable}\\^(\\d+)`));
+    const { power, table } = integralRules(variable);
+
+    // For basic polynomials; anchored so only a bare power matches
+    const powerMatch = expr.match(power);
     if (powerMatch) {
       const n = parseInt(powerMatch[1]);
       return `${variable}^${n + 1}/${n + 1}`;
     }
     
     // For basic functions
-    const rules = {
-      'e^x': 'e^x',
-      '1/x': `ln|${variable}|`,
-      [`sin(${variable})`]: `-cos(${variable})`,
-      [`cos(${variable})`]: `sin(${variable})`,
-      'x': 'x^2/2'
-    };
-    
-    return rules[expr] || 'Cannot compute integral symbolically for this expression';
+    return table.get(expr) || 'Cannot compute integral symbolically for this expression';
   } catch (e) {
     throw new Error(`Integral error: ${e.message}`);
   }
 };
 
+// Position of each sample within its subinterval, as a fraction of dx.
+const SAMPLE_OFFSETS = { left: 0, midpoint: 0.5, right: 1 };
+
 export const riemannSum = (expr, variable, a, b, n, method = 'midpoint') => {
   if (n <= 0) throw new Error('n must be positive');
   if (n > 100000) throw new Error('n too large for safety');
 
   try {
     const deltaX = (b - a) / n;
+    const f = compileNumeric(expr, variable);
     let sum = 0;
-    const node = math.parse(expr);
-    const scope = {};
-    
-    if (method === 'left' || method === 'right') {
-      const offset = method === 'right' ? 1 : 0;
-      for (let i = 0; i < n; i++) {
-        const x = a + (i + offset) * deltaX;
-        scope[variable] = x;
-        sum += node.evaluate(scope) * deltaX;
-      }
-    } else if (method === 'midpoint') {
+
+    // Each branch samples and accumulates in a single pass, with no
+    // intermediate array of samples.
+    if (Object.hasOwn(SAMPLE_OFFSETS, method)) {
+      // Left, right and midpoint differ only in where the first sample sits.
+      const x0 = a + SAMPLE_OFFSETS[method] * deltaX;
       for (let i = 0; i < n; i++) {
-        const x = a + (i + 0.5) * deltaX;
-        scope[variable] = x;
-        sum += node.evaluate(scope) * deltaX;
+        sum += f(x0 + i * deltaX);
       }
+      sum *= deltaX;
     } else if (method === 'trapezoid') {
-      for (let i = 0; i <= n; i++) {
-        const x = a + i * deltaX;
-        scope[variable] = x;
-        const coef = (i === 0 || i === n) ? 0.5 : 1;
-        sum += coef * node.evaluate(scope) * deltaX;
+      // dx * ((y0 + yn) / 2 + y1 + ... + y(n-1))
+      for (let i = 1; i < n; i++) {
+        sum += f(a + i * deltaX);
       }
+      sum = (sum + 0.5 * (f(a) + f(b))) * deltaX;
     }
     
     return sum;
@@ -78,21 +91,20 @@ export const darbouxSum = (expr, variable, a, b, n, type = 'upper') => {
 
   try {
     const deltaX = (b - a) / n;
+    const f = compileNumeric(expr, variable);
+
+    // Pick the bound once instead of re-testing `type` per interval.
+    const bound = type === 'upper' ? Math.max : Math.min;
+
+    // Walk the endpoints once, carrying the shared boundary value forward.
     let sum = 0;
-    const node = math.parse(expr);
-    const scope = {};
-
-    for (let i = 0; i < n; i++) {
-      const x1 = a + i * deltaX;
-      const x2 = x1 + deltaX;
-      scope[variable] = x1;
-      const y1 = node.evaluate(scope);
-      scope[variable] = x2;
-      const y2 = node.evaluate(scope);
-      
-      const value = type === 'upper' ? Math.max(y1, y2) : Math.min(y1, y2);
-      sum += value * deltaX;
+    let left = f(a);
+    for (let i = 1; i <= n; i++) {
+      const right = f(a + i * deltaX);
+      sum += bound(left, right);
+      left = right;
     }
+    sum *= deltaX;
     
     return sum;
   } catch (e) {
@@ -102,19 +114,17 @@ export const darbouxSum = (expr, variable, a, b, n, type = 'upper') => {
 
 export const findLimit = (expr, variable, approach) => {
   try {
-    const node = math.parse(expr);
-    const scope = {};
-    const epsilon = 1e-10;
+    const f = compileNumeric(expr, variable);
+    // Scale the step so approach ± epsilon stays distinct from approach
+    const epsilon = 1e-10 * Math.max(1, Math.abs(approach));
     
     // Evaluate near the approach point
-    scope[variable] = approach + epsilon;
-    const rightLimit = node.evaluate(scope);
-    
-    scope[variable] = approach - epsilon;
-    const leftLimit = node.evaluate(scope);
+    const rightLimit = f(approach + epsilon);
+    const leftLimit = f(approach - epsilon);
     
     // Check if limits from both sides are approximately equal
-    if (Math.abs(rightLimit - leftLimit) < 1e-6) {
+    const scale = Math.max(1, Math.abs(rightLimit), Math.abs(leftLimit));
+    if (Math.abs(rightLimit - leftLimit) < 1e-6 * scale) {
       return (rightLimit + leftLimit) / 2;
     }
     
@@ -0,0 +1,181 @@
+import * as math from 'mathjs';
+import { memoize } from './cache.js';
+
+// Tool calls from agents tend to repeat the same expression strings, and
+// parsing/compiling dominates the cost of short numeric workloads.
+// Parsed nodes and compiled code are treated as immutable and shared.
+//
+// Callers evaluating in a loop should reuse one Map as the scope: compiled
+// evaluate() uses a Map directly, whereas a plain object is wrapped in a
+// fresh ObjectWrappingMap (with safe-property checks on every lookup) per call.
+
+export const parseExpression = memoize((expr) => math.parse(expr));
+
+export const compileExpression = memoize((expr) => parseExpression(expr).compile());
+
+// Single-variable expressions built only from the nodes below are compiled
+// straight to closures over Math, bypassing mathjs's typed-function dispatch
+// per operation. Results match mathjs wherever mathjs returns a real number;
+// where it would return a complex value (e.g. sqrt(-1), asin(2)) these
+// return NaN, unless compiled with `real: false` (see compileNumeric).
+const NUMERIC_CONSTANTS = {
+  pi: Math.PI,
+  PI: Math.PI,
+  e: Math.E,
+  E: Math.E,
+  tau: 2 * Math.PI
+};
+
+const NUMERIC_FUNCTIONS = {
+  sin: Math.sin,
+  cos: Math.cos,
+  tan: Math.tan,
+  asin: Math.asin,
+  acos: Math.acos,
+  atan: Math.atan,
+  sinh: Math.sinh,
+  cosh: Math.cosh,
+  tanh: Math.tanh,
+  exp: Math.exp,
+  log: Math.log,
+  log10: Math.log10,
+  log2: Math.log2,
+  sqrt: Math.sqrt,
+  cbrt: Math.cbrt,
+  abs: Math.abs
+};
+
+const NUMERIC_BINARY_FUNCTIONS = {
+  pow: Math.pow,
+  atan2: Math.atan2,
+  log: (x, base) => Math.log(x) / Math.log(base)
+};
+
+const NUMERIC_OPERATORS = {
+  add: (f, g) => (x) => f(x) + g(x),
+  subtract: (f, g) => (x) => f(x) - g(x),
+  multiply: (f, g) => (x) => f(x) * g(x),
+  divide: (f, g) => (x) => f(x) / g(x),
+  pow: (f, g) => (x) => Math.pow(f(x), g(x))
+};
+
+// Closures for variable-free subtrees are tagged so that their parents can
+// fold them into a single constant at compile time. This matters most for
+// unsimplified derivatives, which are full of terms like (2 - 1) and * 1.
+const constantClosures = new WeakSet();
+
+const constant = (value) => {
+  const f = () => value;
+  constantClosures.add(f);
+  return f;
+};
+
+const fold = (f, args) => (args.every((arg) => constantClosures.has(arg)) ? constant(f()) : f);
+
+// Returns a closure for the subtree, or null if it uses anything else.
+const toNumeric = (node, variable) => {
+  switch (node.type) {
+    case 'ConstantNode': {
+      const { value } = node;
+      return typeof value === 'number' ? constant(value) : null;
+    }
+    case 'SymbolNode': {
+      if (node.name === variable) return (x) => x;
+      if (!Object.hasOwn(NUMERIC_CONSTANTS, node.name)) return null;
+      return constant(NUMERIC_CONSTANTS[node.name]);
+    }
+    case 'ParenthesisNode':
+      return toNumeric(node.content, variable);
+    case 'OperatorNode': {
+      const args = node.args.map((arg) => toNumeric(arg, variable));
+      if (args.includes(null)) return null;
+      if (args.length === 1) {
+        const [f] = args;
+        if (node.fn === 'unaryMinus') return fold((x) => -f(x), args);
+        if (node.fn === 'unaryPlus') return f;
+        return null;
+      }
+      if (args.length !== 2 || !Object.hasOwn(NUMERIC_OPERATORS, node.fn)) return null;
+      return fold(NUMERIC_OPERATORS[node.fn](args[0], args[1]), args);
+    }
+    case 'FunctionNode': {
+      // Only plain calls like sin(x); obj.sin(x) has an AccessorNode callee.
+      if (!node.fn || node.fn.type !== 'SymbolNode') return null;
+      const { name } = node.fn;
+      const args = node.args.map((arg) => toNumeric(arg, variable));
+      if (args.includes(null)) return null;
+      if (args.length === 1 && Object.hasOwn(NUMERIC_FUNCTIONS, name)) {
+        const fn = NUMERIC_FUNCTIONS[name];
+        const [f] = args;
+        return fold((x) => fn(f(x)), args);
+      }
+      if (args.length === 2 && Object.hasOwn(NUMERIC_BINARY_FUNCTIONS, name)) {
+        const fn = NUMERIC_BINARY_FUNCTIONS[name];
+        const [f, g] = args;
+        return fold((x) => fn(f(x), g(x)), args);
+      }
+      return null;
+    }
+    default:
+      return null;
+  }
+};
+
+// Compiled mathjs code behind a plain `(x) => value` signature, with one
+// reused Map scope.
+const toCompiled = (node, variable) => {
+  const code = node.compile();
+  const scope = new Map();
+  return (x) => {
+    scope.set(variable, x);
+    return code.evaluate(scope);
+  };
+};
+
+// Native closure when the tree allows it, otherwise the compiled mathjs code.
+// When complex results are wanted, NaN samples from the native closure are
+// re-evaluated through mathjs, which returns the complex value instead.
+const toCallable = (node, variable, real = true) => {
+  const native = toNumeric(node, variable);
+  if (!native) return toCompiled(node, variable);
+  if (real) return native;
+
+  const compiled = toCompiled(node, variable);
+  return (x) => {
+    const value = native(x);
+    return Number.isNaN(value) ? compiled(x) : value;
+  };
+};
+
+/**
+ * Compiles a single-variable expression to a plain `(x) => value` function,
+ * using native Math closures when possible and the compiled mathjs
+ * expression otherwise.
+ * @param {string} expr
+ * @param {string} variable
+ * @param {{ real?: boolean }} [options] pass `real: false` to get mathjs
+ *   complex values where the real-only closures would return NaN
+ * @returns {(x: number) => any}
+ */
+export const compileNumeric = memoize(
+  (expr, variable, { real = true } = {}) => toCallable(parseExpression(expr), variable, real),
+  { key: (expr, variable, { real = true } = {}) => JSON.stringify([expr, variable, real]) }
+);
+
+// Compiled derivatives are only ever evaluated numerically, so skip the
+// simplify() pass mathjs runs by default; it costs far more than the
+// handful of extra operations it would save per evaluation.
+
+/**
+ * Compiles d(expr)/d(variable) to a plain `(x) => value` function.
+ * @param {string} expr
+ * @param {string} variable
+ * @returns {(x: number) => any}
+ */
+export const compileDerivative = memoize(
+  (expr, variable) => {
+    const node = math.derivative(parseExpression(expr), variable, { simplify: false });
+    return toCallable(node, variable);
+  },
+  { key: (expr, variable) => JSON.stringify([expr, variable]) }
+);
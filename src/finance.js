@@ -1,64 +1,149 @@
-import * as math from 'mathjs';
+import { memoize } from './cache.js';
 
-export const normalCDF = (x) => {
+const INV_SQRT_2PI = 1 / Math.sqrt(2 * Math.PI);
+
+export const normalPDF = (x) => {
+  return INV_SQRT_2PI * Math.exp(-0.5 * x * x);
+};
+
+// Abramowitz & Stegun 26.2.17 (|error| < 7.5e-8) given d = normalPDF(x),
+// so callers already holding the density skip a second Math.exp.
+const normalCDFFromPDF = (x, d) => {
   const t = 1 / (1 + 0.2316419 * Math.abs(x));
-  const d = 0.3989423 * Math.exp(-x * x / 2);
   const p = d * t * (0.319381530 + t * (-0.356563782 + t * (1.781477937 + t * (-1.821255978 + t * 1.330274429))));
   return x >= 0 ? 1 - p : p;
 };
 
-export const normalPDF = (x) => {
-  return (1 / Math.sqrt(2 * Math.PI)) * Math.exp(-0.5 * x * x);
+export const normalCDF = (x) => normalCDFFromPDF(x, normalPDF(x));
+
+// The whole Black-Scholes evaluation for one option: one log, one sqrt and
+// two exps, with every Greek reusing the shared intermediates. Pricing, the
+// Greeks and both batch variants run through this single function, so V8
+// optimises one hot monomorphic kernel. Inputs must already be validated.
+const blackScholesKernel = (S, K, T, r, sigma, optionType) => {
+  const sqrtT = Math.sqrt(T);
+  const volSqrtT = sigma * sqrtT;
+  const d1 = (Math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / volSqrtT;
+  const d2 = d1 - volSqrtT;
+  const discountedK = K * Math.exp(-r * T);
+  // S * pdf(d1) = K * e^(-rT) * pdf(d2), so one exp yields both densities.
+  // The ratio breaks down once pdf(d1) or K * e^(-rT) under/overflows.
+  const pdfD1 = normalPDF(d1);
+  const pdfRatio = S * pdfD1 / discountedK;
+  const pdfD2 = pdfD1 > 0 && Number.isFinite(discountedK) && Number.isFinite(pdfRatio)
+    ? pdfRatio
+    : normalPDF(d2);
+  const cdfD1 = normalCDFFromPDF(d1, pdfD1);
+  const cdfD2 = normalCDFFromPDF(d2, pdfD2);
+  // Puts use N(-d) = 1 - N(d): delta and the signed N(d2) shift by -1.
+  const isCall = optionType === 'call';
+  const delta = isCall ? cdfD1 : cdfD1 - 1;
+  const signedCdfD2 = isCall ? cdfD2 : cdfD2 - 1;
+
+  return {
+    price: S * delta - discountedK * signedCdfD2,
+    delta,
+    gamma: pdfD1 / (S * volSqrtT),
+    vega: S * pdfD1 * sqrtT,
+    theta: -(S * pdfD1 * sigma) / (2 * sqrtT) - r * discountedK * signedCdfD2,
+    rho: T * discountedK * signedCdfD2
+  };
 };
 
-export const blackScholes = (S, K, T, r, sigma, optionType = 'call') => {
+const assertPositiveInputs = (S, K, T, sigma) => {
   if (S <= 0 || K <= 0 || T <= 0 || sigma <= 0) {
     throw new Error('S, K, T, and sigma must be positive');
   }
+};
+
+const assertOptionType = (optionType) => {
+  if (optionType !== 'call' && optionType !== 'put') {
+    throw new Error('Invalid option type. Must be "call" or "put".');
+  }
+};
+
+// Agents often re-price the exact same contract within a session (e.g.
+// black_scholes followed by option_greeks). Both tools share one cache of
+// kernel results. Numbers stringify exactly, so the joined arguments are a
+// lossless key.
+const evaluateOption = memoize(blackScholesKernel, {
+  key: (S, K, T, r, sigma, optionType) => `${S}|${K}|${T}|${r}|${sigma}|${optionType}`
+});
+
+export const blackScholes = (S, K, T, r, sigma, optionType = 'call') => {
+  assertPositiveInputs(S, K, T, sigma);
   try {
-    const d1 = (Math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * Math.sqrt(T));
-    const d2 = d1 - sigma * Math.sqrt(T);
-
-    if (optionType === 'call') {
-      return S * normalCDF(d1) - K * Math.exp(-r * T) * normalCDF(d2);
-    } else if (optionType === 'put') {
-      return K * Math.exp(-r * T) * normalCDF(-d2) - S * normalCDF(-d1);
-    } else {
-      throw new Error('Invalid option type. Must be "call" or "put".');
-    }
+    assertOptionType(optionType);
+    return evaluateOption(S, K, T, r, sigma, optionType).price;
   } catch (e) {
     throw new Error(`Black-Scholes error: ${e.message}`);
   }
 };
 
-export const optionGreeks = (S, K, T, r, sigma, optionType = 'call') => {
-  if (S <= 0 || K <= 0 || T <= 0 || sigma <= 0) {
-    throw new Error('S, K, T, and sigma must be positive');
+// Batch inputs may mix arrays and scalars; scalars apply to every option.
+const batchLength = (inputs) => {
+  let length = null;
+  for (const value of inputs) {
+    if (!Array.isArray(value)) continue;
+    if (length !== null && value.length !== length) {
+      throw new Error('Array inputs must all have the same length');
+    }
+    length = value.length;
+  }
+  return length ?? 1;
+};
+
+const batchValue = (value, i) => (Array.isArray(value) ? value[i] : value);
+
+// Runs the kernel for every option in a batch, bypassing the per-option cache.
+const evaluateBatch = (S, K, T, r, sigma, optionType) => {
+  const length = batchLength([S, K, T, r, sigma, optionType]);
+  const results = new Array(length);
+
+  for (let i = 0; i < length; i++) {
+    const s = batchValue(S, i);
+    const k = batchValue(K, i);
+    const t = batchValue(T, i);
+    const vol = batchValue(sigma, i);
+    const type = batchValue(optionType, i);
+    assertPositiveInputs(s, k, t, vol);
+    assertOptionType(type);
+    results[i] = blackScholesKernel(s, k, t, batchValue(r, i), vol, type);
   }
+
+  return results;
+};
+
+export const blackScholesBatch = (S, K, T, r, sigma, optionType = 'call') => {
   try {
-    const d1 = (Math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * Math.sqrt(T));
-    const d2 = d1 - sigma * Math.sqrt(T);
-
-    let delta, gamma, vega, theta, rho;
-
-    if (optionType === 'call') {
-      delta = normalCDF(d1);
-      gamma = normalPDF(d1) / (S * sigma * Math.sqrt(T));
-      vega = S * normalPDF(d1) * Math.sqrt(T);
-      theta = -(S * normalPDF(d1) * sigma) / (2 * Math.sqrt(T)) - 
-             r * K * Math.exp(-r * T) * normalCDF(d2);
-      rho = K * T * Math.exp(-r * T) * normalCDF(d2);
-    } else if (optionType === 'put') {
-      delta = normalCDF(d1) - 1;
-      gamma = normalPDF(d1) / (S * sigma * Math.sqrt(T));
-      vega = S * normalPDF(d1) * Math.sqrt(T);
-      theta = -(S * normalPDF(d1) * sigma) / (2 * Math.sqrt(T)) + 
-             r * K * Math.exp(-r * T) * normalCDF(-d2);
-      rho = -K * T * Math.exp(-r * T) * normalCDF(-d2);
-    } else {
-      throw new Error('Invalid option type. Must be "call" or "put".');
-    }
+    return evaluateBatch(S, K, T, r, sigma, optionType).map((result) => result.price);
+  } catch (e) {
+    throw new Error(`Black-Scholes batch error: ${e.message}`);
+  }
+};
+
+// Returns structure-of-arrays Greeks: { delta: [...], gamma: [...], ... }.
+export const optionGreeksBatch = (S, K, T, r, sigma, optionType = 'call') => {
+  try {
+    const results = evaluateBatch(S, K, T, r, sigma, optionType);
+    return {
+      delta: results.map((result) => result.delta),
+      gamma: results.map((result) => result.gamma),
+      vega: results.map((result) => result.vega),
+      theta: results.map((result) => result.theta),
+      rho: results.map((result) => result.rho)
+    };
+  } catch (e) {
+    throw new Error(`Option Greeks batch error: ${e.message}`);
+  }
+};
 
+export const optionGreeks = (S, K, T, r, sigma, optionType = 'call') => {
+  assertPositiveInputs(S, K, T, sigma);
+  try {
+    assertOptionType(optionType);
+    // Destructure into a fresh object so callers can't mutate the cached entry.
+    const { delta, gamma, vega, theta, rho } = evaluateOption(S, K, T, r, sigma, optionType);
     return { delta, gamma, vega, theta, rho };
   } catch (e) {
     throw new Error(`Option Greeks error: ${e.message}`);
@@ -67,28 +152,68 @@ export const optionGreeks = (S, K, T, r, sigma, optionType = 'call') => {
 
 export const sharpeRatio = (returns, riskFreeRate = 0) => {
   if (returns.length < 2) throw new Error('Need at least two return values');
-  const avgReturn = math.mean(returns);
-  const stdDev = math.std(returns);
+  // Welford's update: mean and sum of squared deviations in a single pass,
+  // without the cancellation of the naive sum-of-squares formula.
+  let avgReturn = 0;
+  let squares = 0;
+  let count = 0;
+  for (const value of returns) {
+    count++;
+    const delta = value - avgReturn;
+    avgReturn += delta / count;
+    squares += delta * (value - avgReturn);
+  }
+  // Sample (n - 1) standard deviation, matching math.std's default.
+  const stdDev = Math.sqrt(squares / (count - 1));
   if (stdDev === 0) return 0;
   return (avgReturn - riskFreeRate) / stdDev;
 };
 
+// Hoare quickselect: partially orders `values` in place until values[k]
+// holds the k-th smallest element. Expected O(n), versus O(n log n) for
+// sorting the whole series just to read one quantile.
+const selectKth = (values, k) => {
+  let lo = 0;
+  let hi = values.length - 1;
+  while (lo < hi) {
+    const pivot = values[(lo + hi) >> 1];
+    let i = lo;
+    let j = hi;
+    while (i <= j) {
+      while (values[i] < pivot) i++;
+      while (values[j] > pivot) j--;
+      if (i <= j) {
+        const tmp = values[i];
+        values[i] = values[j];
+        values[j] = tmp;
+        i++;
+        j--;
+      }
+    }
+    if (k <= j) hi = j;
+    else if (k >= i) lo = i;
+    else break;
+  }
+  return values[k];
+};
+
 export const valueAtRisk = (returns, confidence = 0.95) => {
   if (returns.length < 10) throw new Error('Need more data for VaR calculation');
-  const sortedReturns = [...returns].sort((a, b) => a - b);
-  const index = Math.floor((1 - confidence) * sortedReturns.length);
-  return -sortedReturns[index];
+  const index = Math.floor((1 - confidence) * returns.length);
+  if (index >= returns.length) return NaN;
+  return -selectKth(Float64Array.from(returns), index);
 };
 
 export const cashflowSchedule = (principal, rate, periods, compounds = 1) => {
-  const schedule = [];
+  // Size the schedule up front; `i <= periods` runs floor(periods) times.
+  const schedule = new Array(periods >= 1 ? Math.floor(periods) : 0);
   const periodicRate = rate / compounds;
   let balance = principal;
   
-  for (let i = 1; i <= periods; i++) {
+  for (let i = 1; i <= schedule.length; i++) {
     const interest = balance * periodicRate;
     balance += interest;
-    schedule.push({ period: i, interest, balance });
+    schedule[i - 1] = { period: i, interest, balance };
   }
   return schedule;
 };
@@ -1,15 +1,14 @@
-import * as math from 'mathjs';
+import { compileNumeric, compileDerivative } from './expression.js';
 
 export const findRoot = (expression, variable, guess, maxIterations = 100, tolerance = 1e-7) => {
   try {
-    const node = math.parse(expression);
-    const derivativeNode = math.derivative(node, variable);
+    const f = compileNumeric(expression, variable);
+    const df = compileDerivative(expression, variable);
     
     let x = guess;
     for (let i = 0; i < maxIterations; i++) {
-      const scope = { [variable]: x };
-      const f_x = node.evaluate(scope);
-      const df_x = derivativeNode.evaluate(scope);
+      const f_x = f(x);
+      const df_x = df(x);
       
       if (Math.abs(df_x) < 1e-12) break; // Avoid division by zero
       
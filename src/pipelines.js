@@ -1,4 +1,24 @@
 import * as math from 'mathjs';
+import { compileExpression } from './expression.js';
+
+// Returns `value` with every '$LAST' replaced by `lastResult`. Only arrays
+// and objects that actually contain a placeholder are copied, so steps
+// without one reuse their args as-is instead of a JSON round trip.
+const substituteLast = (value, lastResult) => {
+  if (value === '$LAST') return lastResult;
+  if (value === null || typeof value !== 'object') return value;
+
+  let copy = null;
+  for (const key of Object.keys(value)) {
+    const item = value[key];
+    const replaced = substituteLast(item, lastResult);
+    if (replaced !== item) {
+      copy = copy || (Array.isArray(value) ? [...value] : { ...value });
+      copy[key] = replaced;
+    }
+  }
+  return copy || value;
+};
 
 /**
  * Evaluates a chain of operations.
@@ -12,14 +32,17 @@ export const evaluateChain = (operations) => {
   for (const step of operations) {
     const { op, args } = step;
     // Replace placeholder in args with lastResult if present
-    const processedArgs = JSON.parse(JSON.stringify(args), (key, value) => {
-      return value === '$LAST' ? lastResult : value;
-    });
+    const processedArgs = substituteLast(args, lastResult);
 
     // This is a simplified version. A real implementation would map 'op' to actual tool functions.
     // For now, we'll use math.evaluate if it's a simple math op, or handle specific cases.
     if (op === 'math') {
-      lastResult = math.evaluate(processedArgs.expression, processedArgs.scope || {});
+      const { expression, scope = {} } = processedArgs;
+      // Strings share the compiled-expression cache with the other tools;
+      // anything else (e.g. an array of expressions) goes through math.evaluate.
+      lastResult = typeof expression === 'string'
+        ? compileExpression(expression).evaluate(scope)
+        : math.evaluate(expression, scope);
     } else {
       throw new Error(`Operation ${op} not supported in chain yet.`);
     }
@@ -1,24 +1,32 @@
 import * as math from 'mathjs';
+import { compileNumeric } from './expression.js';
 
 export const laplaceTransform = (expr, t, s) => {
   try {
-    const node = math.parse(expr);
+    const f = compileNumeric(expr, t, { real: false });
     // Using numerical integration for a basic approximation
     const upperLimit = 100; // Approximation of infinity
     const steps = 1000;
     const dt = upperLimit / steps;
-    let result = math.complex(0, 0);
+    // Accumulate in plain floats; e^(-st) is real, so only f(t) can be complex.
+    // The kernel is advanced by one multiply per step: e^(-s(t+dt)) = e^(-st) * e^(-s*dt).
+    const decay = Math.exp(-s * dt);
+    let weight = dt;
+    let re = 0;
+    let im = 0;
     
-    for (let i = 0; i < steps; i++) {
-      const time = i * dt;
-      const scope = { [t]: time };
-      const ft = node.evaluate(scope);
-      const expTerm = math.exp(math.multiply(math.complex(-s, 0), time));
-      result = math.add(result, 
-        math.multiply(ft, expTerm, dt));
+    for (let i = 0; i < steps; i++, weight *= decay) {
+      const ft = f(i * dt);
+      if (typeof ft === 'number') {
+        re += ft * weight;
+      } else {
+        const c = math.complex(ft);
+        re += c.re * weight;
+        im += c.im * weight;
+      }
     }
     
-    return result.toString();
+    return math.complex(re, im).toString();
   } catch (e) {
     throw new Error(`Laplace Transform error: ${e.message}`);
   }
@@ -26,29 +34,37 @@ export const laplaceTransform = (expr, t, s) => {
 
 export const fourierTransform = (expr, t, omega) => {
   try {
-    const node = math.parse(expr);
+    const f = compileNumeric(expr, t, { real: false });
     // Using numerical integration for a basic approximation
     const limit = 50; // Approximation of infinity
     const steps = 1000;
     const dt = (2 * limit) / steps;
-    let result = math.complex(0, 0);
+    // f(t) * e^(-i*omega*t) expanded as (a + bi)(cos - i*sin) in plain floats.
+    // The phasor (cos, sin) of omega*t, pre-scaled by dt, is rotated by
+    // omega*dt each step instead of calling Math.cos/Math.sin per sample.
+    const stepCos = Math.cos(omega * dt);
+    const stepSin = Math.sin(omega * dt);
+    let cos = Math.cos(-omega * limit) * dt;
+    let sin = Math.sin(-omega * limit) * dt;
+    let re = 0;
+    let im = 0;
     
     for (let i = 0; i < steps; i++) {
-      const time = -limit + i * dt;
-      const scope = { [t]: time };
-      const ft = node.evaluate(scope);
-      const expTerm = math.exp(
-        math.multiply(
-          math.complex(0, -1),
-          omega,
-          time
-        )
-      );
-      result = math.add(result, 
-        math.multiply(ft, expTerm, dt));
+      const ft = f(-limit + i * dt);
+      if (typeof ft === 'number') {
+        re += ft * cos;
+        im -= ft * sin;
+      } else {
+        const c = math.complex(ft);
+        re += c.re * cos + c.im * sin;
+        im += c.im * cos - c.re * sin;
+      }
+      const nextCos = cos * stepCos - sin * stepSin;
+      sin = sin * stepCos + cos * stepSin;
+      cos = nextCos;
     }
     
-    return result.toString();
+    return math.complex(re, im).toString();
   } catch (e) {
     throw new Error(`Fourier Transform error: ${e.message}`);
   }
@@ -57,17 +73,34 @@ export const fourierTransform = (expr, t, omega) => {
 export const zTransform = (expr, n, z, limit = 100) => {
   if (limit > 10000) throw new Error('Limit too large for safety');
   try {
-    const node = math.parse(expr);
-    let result = math.complex(0, 0);
+    const f = compileNumeric(expr, n, { real: false });
+    // z^(-k) is carried as a running complex power of 1/z instead of a
+    // mathjs pow() per term; w = 1/z = conj(z) / |z|^2.
+    const zc = math.complex(z);
+    const norm = zc.re * zc.re + zc.im * zc.im;
+    const wRe = zc.re / norm;
+    const wIm = -zc.im / norm;
+    let pRe = 1;
+    let pIm = 0;
+    let re = 0;
+    let im = 0;
     
     for (let k = 0; k <= limit; k++) {
-      const scope = { [n]: k };
-      const fn = node.evaluate(scope);
-      const zTerm = math.pow(z, -k);
-      result = math.add(result, math.multiply(fn, zTerm));
+      const fn = f(k);
+      if (typeof fn === 'number') {
+        re += fn * pRe;
+        im += fn * pIm;
+      } else {
+        const c = math.complex(fn);
+        re += c.re * pRe - c.im * pIm;
+        im += c.re * pIm + c.im * pRe;
+      }
+      const nextRe = pRe * wRe - pIm * wIm;
+      pIm = pRe * wIm + pIm * wRe;
+      pRe = nextRe;
     }
     
-    return result.toString();
+    return math.complex(re, im).toString();
   } catch (e) {
     throw new Error(`Z-Transform error: ${e.message}`);
   }
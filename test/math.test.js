@@ -1,17 +1,61 @@
+import * as math from 'mathjs';
 import * as calculus from '../src/calculus.js';
 import * as finance from '../src/finance.js';
 import * as linalg from '../src/linear-algebra.js';
+import * as transforms from '../src/transforms.js';
+import * as utils from '../src/utils.js';
+import { memoize } from '../src/cache.js';
+import { compileNumeric } from '../src/expression.js';
 import assert from 'assert';
 
 console.log('Running Math & Finance Tests...');
 
 try {
+  // Cache Tests
+  console.log('- Testing Cache...');
+  let computed = 0;
+  const square = memoize((x) => { computed++; return x * x; }, { maxSize: 2 });
+  square(1); square(2); square(1); square(3); square(2);
+  assert.strictEqual(computed, 4); // 2 was evicted by 3, 1 was kept by its hit
+  assert.throws(() => memoize(square, 256), TypeError);
+
+  // Native numeric compiler Tests
+  console.log('- Testing Expression Compiler...');
+  assert(Math.abs(compileNumeric('log(x, 2)', 'x')(8) - 3) < 1e-12);
+  assert(Math.abs(compileNumeric('atan2(x, 1)', 'x')(1) - Math.PI / 4) < 1e-12);
+  assert.strictEqual(compileNumeric('pi * x', 'x')(2), 2 * Math.PI);
+  assert.strictEqual(compileNumeric('tau + x', 'x')(0), 2 * Math.PI);
+  assert(Math.abs(compileNumeric('2 * pi * x', 'x')(0.5) - Math.PI) < 1e-12); // 2 * pi is folded
+  assert(Number.isNaN(compileNumeric('sqrt(x)', 'x')(-1)));
+  const root = compileNumeric('sqrt(x)', 'x', { real: false })(-1);
+  assert.strictEqual(root.re, 0);
+  assert.strictEqual(root.im, 1);
+  assert.strictEqual(compileNumeric('x mod 3', 'x')(7), math.evaluate('7 mod 3'));
+  // A member call is not the whitelisted function, so mathjs decides (and rejects it).
+  assert.throws(() => compileNumeric('foo.sin(x)', 'x')(1), /foo/);
+
   // Calculus Tests
   console.log('- Testing Calculus...');
   assert.strictEqual(calculus.derivative('x^2', 'x'), '2 * x');
   assert.strictEqual(calculus.integral('x', 'x'), 'x^2/2');
+  assert.strictEqual(calculus.integral('t^2', 't'), 't^3/3');
+  assert.strictEqual(calculus.integral('3*x^2 + 1', 'x'), 'Cannot compute integral symbolically for this expression');
   const sum = calculus.riemannSum('x', 'x', 0, 1, 100, 'midpoint');
   assert(Math.abs(sum - 0.5) < 0.001);
+  assert(Math.abs(calculus.riemannSum('sin(x)', 'x', 0, Math.PI, 1000, 'midpoint') - 2) < 1e-5);
+  assert(Math.abs(calculus.riemannSum('abs(x)', 'x', -1, 1, 100, 'trapezoid') - 1) < 1e-9);
+  const cone = utils.volumeOfRevolution('x', 0, 1);
+  assert(Math.abs(cone - Math.PI / 3) < 1e-5);
+
+  // Transform Tests
+  console.log('- Testing Transforms...');
+  // sqrt(t - 1) is imaginary on [0, 1), so the transform must stay complex rather than NaN.
+  const laplace = transforms.laplaceTransform('sqrt(t-1)', 't', 1);
+  assert(!laplace.includes('NaN') && laplace.includes('i'));
+  // Geometric series: sum of (1/2)^n * 2^-n = 1 / (1 - 1/4).
+  assert(transforms.zTransform('0.5^n', 'n', 2).startsWith('1.333333333333333'));
+  const zComplex = transforms.zTransform('sqrt(n-5)', 'n', 2);
+  assert(!zComplex.includes('NaN') && zComplex.includes('i'));
 
   // Linear Algebra Tests
   console.log('- Testing Linear Algebra...');
@@ -27,7 +71,35 @@ try {
   console.log('- Testing Finance...');
   const price = finance.blackScholes(100, 100, 1, 0.05, 0.2, 'call');
   assert(price > 10 && price < 11); // Approx 10.45
+  // K * e^(-rT) underflows to 0 here; the call is then worth the spot.
+  assert(Math.abs(finance.blackScholes(100, 100, 800, 1, 0.2) - 100) < 1e-9);
+
+  const batch = finance.blackScholesBatch(100, [90, 100], 1, 0.05, 0.2, ['call', 'put']);
+  assert(Math.abs(batch[0] - finance.blackScholes(100, 90, 1, 0.05, 0.2, 'call')) < 1e-9);
+  assert(Math.abs(batch[1] - finance.blackScholes(100, 100, 1, 0.05, 0.2, 'put')) < 1e-9);
+  assert.throws(() => finance.blackScholesBatch([100], [90, 100, 110], 1, 0.05, 0.2), /same length/);
+  const greeks = finance.optionGreeksBatch(100, 95, 0.5, 0.03, 0.25, ['call', 'put']);
+  const putGreeks = finance.optionGreeks(100, 95, 0.5, 0.03, 0.25, 'put');
+  for (const name of Object.keys(putGreeks)) {
+    assert(Math.abs(greeks[name][1] - putGreeks[name]) < 1e-9);
+  }
   
+  // valueAtRisk selects the quantile in place; it must match a full sort,
+  // including on series with many repeated values.
+  let seed = 42;
+  const nextReturn = () => {
+    seed = (seed * 16807) % 2147483647;
+    return Math.round((seed / 2147483647 - 0.5) * 20) / 100;
+  };
+  for (const length of [10, 37, 250]) {
+    const returns = Array.from({ length }, nextReturn);
+    const sorted = [...returns].sort((x, y) => x - y);
+    for (const confidence of [0.9, 0.95, 0.99]) {
+      const expected = -sorted[Math.floor((1 - confidence) * length)];
+      assert.strictEqual(finance.valueAtRisk(returns, confidence), expected);
+    }
+  }
+
   const sharpe = finance.sharpeRatio([0.1, 0.2, -0.05, 0.05], 0.01);
   assert(sharpe > 0);
 